@@ -0,0 +1,177 @@
+"""
+Compiled Simulation Core
+
+Bar-by-bar trade simulation over raw NumPy arrays, compiled with Numba when
+available. Used by the Backtester for strategies whose exits follow the
+standard stop loss / take profit / time-exit bracket.
+
+Results come back as flat arrays (one slot per trade); the Backtester turns
+them into Trade objects once the loop is done.
+"""
+
+import numpy as np
+from ..utils._njit import njit, RO_F8, RO_I8
+from ..utils.exit_codes import EXIT_STOP, EXIT_TARGET, EXIT_TIME, EXIT_EOD
+
+
+# Signals are passed as float64 so any numeric signal column works
+@njit(f'({RO_F8}, {RO_F8}, {RO_F8}, {RO_F8}, {RO_F8}, {RO_F8}, {RO_F8}, {RO_I8}, '
+      'f8, f8, f8, f8, f8, f8, i8)', cache=True, nogil=True)
+def _simulate_core(high, low, close, signal, entry_px_arr, sl_arr, tp_arr,
+                   day_id, point_value, tick_value, slippage_ticks,
+                   commission_per_side, initial_capital, max_daily_loss_pct,
+                   max_bars):
+    """
+    Run the bar loop for a single-contract bracket strategy.
+
+    Mirrors Backtester's Python path: equity is recorded at the start of each
+    bar, bars are skipped once the daily loss limit is hit, an open position
+    is checked for stop/target/time exit, otherwise a signal opens a trade.
+
+    Returns:
+        Tuple of (entry_idx, exit_idx, entry_px, exit_px, direction, pnl,
+        mae, mfe, exit_reason, equity_curve, drawdown_pct, final_equity)
+    """
+    n = high.shape[0]
+    max_trades = n // 2 + 1
+
+    entry_idx = np.empty(max_trades, np.int64)
+    exit_idx = np.empty(max_trades, np.int64)
+    entry_px = np.empty(max_trades, np.float64)
+    exit_px = np.empty(max_trades, np.float64)
+    direction = np.empty(max_trades, np.int8)
+    pnl = np.empty(max_trades, np.float64)
+    mae = np.empty(max_trades, np.float64)
+    mfe = np.empty(max_trades, np.float64)
+    exit_reason = np.empty(max_trades, np.int8)
+
+    equity_curve = np.empty(n, np.float64)
+    drawdown_pct = np.empty(n, np.float64)
+
+    slippage = slippage_ticks * tick_value
+    commission = commission_per_side * 2.0
+
+    equity = initial_capital
+    peak_equity = initial_capital
+    n_trades = 0
+    in_position = False
+    bars_in_trade = 0
+    d = 0
+    ep = 0.0
+    stop = 0.0
+    target = 0.0
+
+    current_day = day_id[0] if n > 0 else 0
+    day_pnl = 0.0
+    day_trades = 0
+
+    for i in range(n):
+        equity_curve[i] = equity
+        drawdown_pct[i] = ((equity - peak_equity) / peak_equity) * 100.0
+
+        if equity > peak_equity:
+            peak_equity = equity
+
+        # Daily loss limit (realized P&L of trades closed today)
+        if day_id[i] != current_day:
+            current_day = day_id[i]
+            day_pnl = 0.0
+            day_trades = 0
+        if day_trades > 0 and (day_pnl / equity) * 100.0 <= -max_daily_loss_pct:
+            continue
+
+        if in_position:
+            bars_in_trade += 1
+            h = high[i]
+            l = low[i]
+
+            # Maximum adverse / favorable excursion
+            if d == 1:
+                current_loss = min(0.0, l - ep)
+                current_profit = max(0.0, h - ep)
+            else:
+                current_loss = min(0.0, ep - h)
+                current_profit = max(0.0, ep - l)
+            mae[n_trades] = min(mae[n_trades], current_loss)
+            mfe[n_trades] = max(mfe[n_trades], current_profit)
+
+            # Bracket exit: stop first, then target, then time
+            code = 0
+            px = 0.0
+            if d == 1:
+                if l <= stop:
+                    px = stop
+                    code = EXIT_STOP
+                elif h >= target:
+                    px = target
+                    code = EXIT_TARGET
+            else:
+                if h >= stop:
+                    px = stop
+                    code = EXIT_STOP
+                elif l <= target:
+                    px = target
+                    code = EXIT_TARGET
+            if code == 0 and bars_in_trade >= max_bars:
+                px = close[i]
+                code = EXIT_TIME
+
+            if code != 0:
+                # Exit slippage works against the position
+                if d == 1:
+                    px -= slippage
+                    points = px - ep
+                else:
+                    px += slippage
+                    points = ep - px
+
+                trade_pnl = points * point_value
+                exit_idx[n_trades] = i
+                exit_px[n_trades] = px
+                pnl[n_trades] = trade_pnl
+                exit_reason[n_trades] = code
+
+                equity += trade_pnl - commission
+                day_pnl += trade_pnl
+                day_trades += 1
+
+                n_trades += 1
+                in_position = False
+                bars_in_trade = 0
+
+        elif signal[i] != 0:
+            if equity > 0:
+                d = 1 if signal[i] == 1 else -1
+                if d == 1:
+                    ep = entry_px_arr[i] + slippage
+                else:
+                    ep = entry_px_arr[i] - slippage
+                stop = sl_arr[i]
+                target = tp_arr[i]
+
+                entry_idx[n_trades] = i
+                entry_px[n_trades] = ep
+                direction[n_trades] = d
+                mae[n_trades] = 0.0
+                mfe[n_trades] = 0.0
+                in_position = True
+
+    # Close any remaining position at the final close
+    if in_position:
+        px = close[n - 1]
+        if d == 1:
+            points = px - ep
+        else:
+            points = ep - px
+        trade_pnl = points * point_value
+        exit_idx[n_trades] = n - 1
+        exit_px[n_trades] = px
+        pnl[n_trades] = trade_pnl
+        exit_reason[n_trades] = EXIT_EOD
+        equity += trade_pnl - commission
+        n_trades += 1
+
+    return (entry_idx[:n_trades], exit_idx[:n_trades], entry_px[:n_trades],
+            exit_px[:n_trades], direction[:n_trades], pnl[:n_trades],
+            mae[:n_trades], mfe[:n_trades], exit_reason[:n_trades],
+            equity_curve, drawdown_pct, equity)
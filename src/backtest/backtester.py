@@ -8,19 +8,26 @@ Simulates trading with realistic conditions including:
 - Performance tracking
 """
 
-from typing import Dict, List
+from typing import Dict, List, Optional
+from collections import defaultdict
+import inspect
+import warnings
 import pandas as pd
 import numpy as np
+from joblib import Parallel, delayed
 from datetime import datetime
-import sys
-import os
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from strategies.base_strategy import BaseStrategy
+from ..strategies.base_strategy import BaseStrategy, SignalBuffer, with_trading_hours
+from ._core import _simulate_core
+from ..utils.exit_codes import EXIT_REASONS
 
 
 class Trade:
     """Represents a single trade from entry to exit."""
     
+    __slots__ = ('entry_time', 'entry_price', 'direction', 'size', 'stop_loss',
+                 'take_profit', 'strategy_name', 'exit_time', 'exit_price',
+                 'exit_reason', 'pnl', 'pnl_pct', 'bars_held', 'mae', 'mfe')
+    
     def __init__(self, entry_time: datetime, entry_price: float, 
                  direction: int, size: int, stop_loss: float, 
                  take_profit: float, strategy_name: str):
@@ -90,13 +97,28 @@ class Trade:
         }
 
 
+# Closed trades are stored column-wise in a structured array; entry and exit
+# times are kept as bar positions into the data index.
+TRADE_DTYPE = np.dtype([
+    ('entry_idx', 'i8'), ('exit_idx', 'i8'),
+    ('entry_price', 'f8'), ('exit_price', 'f8'),
+    ('direction', 'i1'), ('size', 'i4'),
+    ('stop_loss', 'f8'), ('take_profit', 'f8'),
+    ('exit_reason', 'i1'), ('pnl', 'f8'), ('pnl_pct', 'f8'),
+    ('bars_held', 'f8'), ('mae', 'f8'), ('mfe', 'f8')
+])
+
+
 class Backtester:
     """Main backtesting engine."""
     
     def __init__(self, strategy: BaseStrategy, data: pd.DataFrame, config: Dict):
         self.strategy = strategy
-        self.data = data
+        # Trading hours follow config['time_filters'] unless data has 'rth_ok'
+        self.data = with_trading_hours(data, config.get('time_filters', {}))
+        self._source_data = data
         self.config = config
+        self._strategy_name = strategy.get_name()
         
         self.initial_capital = config['trading']['initial_capital']
         self.point_value = config['contract']['point_value']
@@ -112,9 +134,21 @@ class Backtester:
         self.equity = self.initial_capital
         self.peak_equity = self.initial_capital
         self.current_position = None
-        self.trades = []
-        self.equity_curve = []
         self.metrics = {}
+        self._signals = None  # SignalBuffer, set once signals are generated
+        
+        # Closed trades; a trade spans at least two bars so n // 2 + 1 always fits
+        n = len(self.data)
+        self._trades = np.empty(n // 2 + 1, dtype=TRADE_DTYPE)
+        self.n_trades = 0
+        self._reason_codes = {reason: code for code, reason in EXIT_REASONS.items()}
+        
+        # Equity curve, one slot per bar (times come from the data index)
+        self._eq_equity = np.empty(n)
+        self._eq_dd_pct = np.empty(n)
+        
+        # Realized P&L per exit day (keyed by day id), updated as trades close
+        self._daily_pnl: Dict[int, float] = defaultdict(float)
         
     def calculate_slippage(self, entry_price: float, direction: int) -> float:
         """Calculate realistic slippage."""
@@ -131,19 +165,29 @@ class Backtester:
     
     def check_daily_loss_limit(self, current_date: datetime) -> bool:
         """Check if max daily loss limit hit."""
-        todays_trades = [t for t in self.trades if t.exit_time and t.exit_time.date() == current_date.date()]
-        
-        if not todays_trades:
+        current_date = pd.Timestamp(current_date)
+        tz = self.data.index.tz
+        if tz is not None:
+            if current_date.tzinfo is None:
+                current_date = current_date.tz_localize(tz)
+            else:
+                current_date = current_date.tz_convert(tz)
+        day = pd.DatetimeIndex([current_date]).as_unit(self.data.index.unit).normalize()
+        return self._daily_loss_hit(int(day.asi8[0]))
+    
+    def _daily_loss_hit(self, day_id: int) -> bool:
+        """check_daily_loss_limit for a day id as from index.normalize().asi8."""
+        todays_pnl = self._daily_pnl.get(day_id)
+        if todays_pnl is None:
             return False
         
-        todays_pnl = sum(t.pnl for t in todays_trades)
         todays_pnl_pct = (todays_pnl / self.equity) * 100
         
         return todays_pnl_pct <= -self.max_daily_loss_pct
     
     def run(self) -> Dict:
         """Run the backtest simulation."""
-        print(f"\nStarting backtest of {self.strategy.get_name()}...")
+        print(f"\nStarting backtest of {self._strategy_name}...")
         print(f"Initial Capital: ${self.initial_capital:,.2f}")
         print(f"Data Range: {self.data.index[0]} to {self.data.index[-1]}")
         print(f"Total Bars: {len(self.data)}")
@@ -152,43 +196,219 @@ class Backtester:
         self.data = self.strategy.calculate_indicators(self.data)
         
         print("Generating signals...")
+        self.strategy.signals = None
         self.data = self.strategy.generate_signals(self.data)
+        self._signals = self._signal_buffer()
         
         print("\nRunning simulation...")
+        # Nothing can happen before the first signal, so equity is flat until then
+        start = self._first_signal_bar()
+        self._eq_equity[:start] = self.initial_capital
+        self._eq_dd_pct[:start] = 0.0
+        
+        max_bars = _bracket_max_bars(self.strategy)
+        if max_bars is not None:
+            self._run_compiled(max_bars, start)
+        else:
+            self._run_python(start)
+        
+        print("\nCalculating performance metrics...")
+        self.calculate_metrics()
+        
+        print(f"\nBacktest Complete!")
+        print(f"Total Trades: {self.n_trades}")
+        print(f"Final Equity: ${self.equity:,.2f}")
+        print(f"Total Return: {((self.equity - self.initial_capital) / self.initial_capital * 100):.2f}%")
+        
+        return {
+            'metrics': self.metrics,
+            'trades': self.get_trades(),
+            'equity_curve': self.get_equity_curve().to_dict('records')
+        }
+    
+    def run_batch(self, configs: List[Dict], n_jobs: int = -1) -> List[Dict]:
+        """
+        Run one backtest per config in parallel worker processes.
+        
+        Each config has the same layout as the main config; a fresh strategy
+        of this backtester's strategy class is built from its 'strategy'
+        section and run against the original (un-processed) data.
+        """
+        strategy_cls = type(self.strategy)
+        return Parallel(n_jobs=n_jobs, backend='loky')(
+            delayed(_run_one)(strategy_cls, self._source_data, cfg) for cfg in configs
+        )
+    
+    @property
+    def trades(self) -> List[Dict]:
+        """Closed trades as dictionaries (read-only; see get_trades)."""
+        return self.get_trades()
+    
+    def get_trades(self) -> List[Dict]:
+        """Return closed trades as dictionaries (Trade.to_dict of each row of the trade array)."""
+        index = self.data.index
+        reasons = {code: reason for reason, code in self._reason_codes.items()}
+        
+        trades = []
+        for (entry_idx, exit_idx, entry_price, exit_price, direction, size,
+             stop_loss, take_profit, exit_reason, pnl, pnl_pct,
+             bars_held, mae, mfe) in self._trades[:self.n_trades].tolist():
+            trade = Trade(index[entry_idx], entry_price, direction, size,
+                          stop_loss, take_profit, self._strategy_name)
+            trade.exit_time = index[exit_idx]
+            trade.exit_price = exit_price
+            trade.exit_reason = reasons[exit_reason]
+            trade.pnl = pnl
+            trade.pnl_pct = pnl_pct
+            trade.bars_held = bars_held
+            trade.mae = mae
+            trade.mfe = mfe
+            trades.append(trade.to_dict())
+        
+        return trades
+    
+    def _record_trade(self, trade: Trade, entry_idx: int, exit_idx: int):
+        """Append a closed Trade to the trade array."""
+        reason_code = self._reason_codes.setdefault(trade.exit_reason, len(self._reason_codes) + 1)
+        self._trades[self.n_trades] = (
+            entry_idx, exit_idx, trade.entry_price, trade.exit_price,
+            trade.direction, trade.size, trade.stop_loss, trade.take_profit,
+            reason_code, trade.pnl, trade.pnl_pct, trade.bars_held,
+            trade.mae, trade.mfe
+        )
+        self.n_trades += 1
+    
+    def get_equity_curve(self) -> pd.DataFrame:
+        """Return the per-bar equity curve as a DataFrame."""
+        return pd.DataFrame({
+            'time': self.data.index,
+            'equity': self._eq_equity,
+            'drawdown_pct': self._eq_dd_pct
+        })
+    
+    def _signal_buffer(self) -> SignalBuffer:
+        """Signals published by the strategy, or read from the data columns if it has none."""
+        signals = self.strategy.signals
+        if isinstance(signals, SignalBuffer) and signals.index.equals(self.data.index):
+            return signals
+        return SignalBuffer.from_frame(self.data)
+    
+    def _first_signal_bar(self) -> int:
+        """Return the position of the first bar with a signal (len(data) if none)."""
+        signal_bars = np.flatnonzero(self._signals.signal != 0)
+        return int(signal_bars[0]) if len(signal_bars) else len(self.data)
+    
+    def _run_compiled(self, max_bars: int, start: int = 0):
+        """Simulate with the compiled core and copy its result arrays into the trade array."""
+        columns = {
+            col: self.data[col].to_numpy(dtype=np.float64)[start:]
+            for col in ('high', 'low', 'close')
+        }
+        columns.update(
+            (field, getattr(self._signals, field).astype(np.float64, copy=False)[start:])
+            for field in ('signal', 'entry_price', 'stop_loss', 'take_profit')
+        )
+        day_id = self.data.index[start:].normalize().asi8
+        
+        (entry_idx, exit_idx, entry_px, exit_px, direction, pnl,
+         mae, mfe, exit_reason, equity, drawdown_pct, final_equity) = _simulate_core(
+            columns['high'], columns['low'], columns['close'], columns['signal'],
+            columns['entry_price'], columns['stop_loss'], columns['take_profit'],
+            day_id,
+            float(self.point_value), float(self.tick_value), float(self.slippage_ticks),
+            float(self.commission_per_side), float(self.initial_capital),
+            float(self.max_daily_loss_pct), int(max_bars)
+        )
+        
+        index = self.data.index
+        k = len(entry_idx)
+        trades = self._trades[:k]
+        trades['entry_idx'] = entry_idx + start
+        trades['exit_idx'] = exit_idx + start
+        trades['entry_price'] = entry_px
+        trades['exit_price'] = exit_px
+        trades['direction'] = direction
+        trades['size'] = 1
+        trades['stop_loss'] = columns['stop_loss'][entry_idx]
+        trades['take_profit'] = columns['take_profit'][entry_idx]
+        trades['exit_reason'] = exit_reason
+        trades['pnl'] = pnl
+        trades['pnl_pct'] = direction * (exit_px - entry_px) / entry_px * 100
+        trades['bars_held'] = (index[exit_idx + start] - index[entry_idx + start]).total_seconds() / 60 / 5
+        trades['mae'] = mae
+        trades['mfe'] = mfe
+        self.n_trades = k
+        for exit_day, trade_pnl in zip(day_id[exit_idx].tolist(), pnl.tolist()):
+            self._daily_pnl[exit_day] += trade_pnl
+        
+        self.equity = float(final_equity)
+        if len(equity):
+            self.peak_equity = float(equity.max())
+        self._eq_equity[start:] = equity
+        self._eq_dd_pct[start:] = drawdown_pct
+        print(f"  Completed {self.n_trades} trades, Equity: ${self.equity:,.2f}")
+    
+    def _run_python(self, start: int = 0):
+        """Simulate bar by bar, asking the strategy for exits on every bar."""
         bars_in_trade = 0
+        entry_idx = 0
         
-        for i in range(len(self.data)):
-            current_bar = self.data.iloc[i]
-            current_time = self.data.index[i]
+        # Snapshot columns once; per-bar access is plain array indexing
+        h, l, c = (self.data[col].to_numpy(dtype=np.float64) for col in ('high', 'low', 'close'))
+        epx, sl, tp = (
+            getattr(self._signals, field).astype(np.float64, copy=False)
+            for field in ('entry_price', 'stop_loss', 'take_profit')
+        )
+        sig = self._signals.signal
+        times = self.data.index
+        day_ids = times.normalize().asi8.tolist()
+        
+        legacy_exit_api = _takes_data_slice(self.strategy.get_exit_price)
+        if legacy_exit_api:
+            warnings.warn(
+                f"{type(self.strategy).__name__}.get_exit_price(entry_price, stop_loss, "
+                "take_profit, bars_in_trade, data_slice) is deprecated; accept the "
+                "bar's high, low, close and the position direction instead",
+                DeprecationWarning,
+                stacklevel=3
+            )
+        
+        bars = zip(h[start:], l[start:], c[start:], sig[start:], epx[start:],
+                   sl[start:], tp[start:], day_ids[start:])
+        for i, (high, low, close, signal, entry_px, stop_loss, take_profit, day_id) in enumerate(bars, start):
             
-            self.equity_curve.append({
-                'time': current_time,
-                'equity': self.equity,
-                'drawdown_pct': ((self.equity - self.peak_equity) / self.peak_equity) * 100
-            })
+            self._eq_equity[i] = self.equity
+            self._eq_dd_pct[i] = ((self.equity - self.peak_equity) / self.peak_equity) * 100
             
             if self.equity > self.peak_equity:
                 self.peak_equity = self.equity
             
-            if self.check_daily_loss_limit(current_time):
+            if self._daily_loss_hit(day_id):
                 continue
             
             # Manage open position
             if self.current_position is not None:
                 bars_in_trade += 1
                 
-                self.current_position.update_excursion(
-                    current_bar['high'],
-                    current_bar['low']
-                )
+                self.current_position.update_excursion(high, low)
                 
-                exit_price, exit_reason = self.strategy.get_exit_price(
-                    self.current_position.entry_price,
-                    self.current_position.stop_loss,
-                    self.current_position.take_profit,
-                    bars_in_trade,
-                    self.data.iloc[i:i+1]
-                )
+                if legacy_exit_api:
+                    exit_price, exit_reason = self.strategy.get_exit_price(
+                        self.current_position.entry_price,
+                        self.current_position.stop_loss,
+                        self.current_position.take_profit,
+                        bars_in_trade,
+                        self.data.iloc[i:i + 1]
+                    )
+                else:
+                    exit_price, exit_reason = self.strategy.get_exit_price(
+                        self.current_position.entry_price,
+                        self.current_position.stop_loss,
+                        self.current_position.take_profit,
+                        bars_in_trade,
+                        high, low, close,
+                        self.current_position.direction
+                    )
                 
                 if exit_price is not None:
                     exit_price = self.calculate_slippage(
@@ -197,7 +417,7 @@ class Backtester:
                     )
                     
                     self.current_position.close(
-                        current_time,
+                        times[i],
                         exit_price,
                         exit_reason,
                         self.point_value
@@ -205,102 +425,95 @@ class Backtester:
                     
                     commission = self.calculate_commission(self.current_position.size)
                     self.equity += self.current_position.pnl - commission
+                    self._daily_pnl[day_id] += self.current_position.pnl
                     
-                    self.trades.append(self.current_position)
+                    self._record_trade(self.current_position, entry_idx, i)
                     self.current_position = None
                     bars_in_trade = 0
                     
-                    if len(self.trades) % 10 == 0:
-                        print(f"  Completed {len(self.trades)} trades, Equity: ${self.equity:,.2f}")
+                    if self.n_trades % 10 == 0:
+                        print(f"  Completed {self.n_trades} trades, Equity: ${self.equity:,.2f}")
             
             # Check for new entry
-            elif current_bar['signal'] != 0:
+            elif signal != 0:
                 if self.current_position is None and self.equity > 0:
-                    signal = current_bar['signal']
-                    entry_price = current_bar['entry_price']
-                    entry_price = self.calculate_slippage(entry_price, signal)
+                    entry_price = self.calculate_slippage(entry_px, signal)
+                    entry_idx = i
                     
                     self.current_position = Trade(
-                        entry_time=current_time,
+                        entry_time=times[i],
                         entry_price=entry_price,
                         direction=signal,
                         size=1,
-                        stop_loss=current_bar['stop_loss'],
-                        take_profit=current_bar['take_profit'],
-                        strategy_name=self.strategy.get_name()
+                        stop_loss=stop_loss,
+                        take_profit=take_profit,
+                        strategy_name=self._strategy_name
                     )
         
         # Close any remaining position
         if self.current_position is not None:
-            final_bar = self.data.iloc[-1]
             self.current_position.close(
-                self.data.index[-1],
-                final_bar['close'],
+                times[-1],
+                c[-1],
                 'end_of_data',
                 self.point_value
             )
             self.equity += self.current_position.pnl - self.calculate_commission(1)
-            self.trades.append(self.current_position)
-        
-        print("\nCalculating performance metrics...")
-        self.calculate_metrics()
-        
-        print(f"\nBacktest Complete!")
-        print(f"Total Trades: {len(self.trades)}")
-        print(f"Final Equity: ${self.equity:,.2f}")
-        print(f"Total Return: {((self.equity - self.initial_capital) / self.initial_capital * 100):.2f}%")
-        
-        return {
-            'metrics': self.metrics,
-            'trades': [t.to_dict() for t in self.trades],
-            'equity_curve': self.equity_curve
-        }
+            self._record_trade(self.current_position, entry_idx, len(self.data) - 1)
+            self.current_position = None
     
     def calculate_metrics(self):
         """Calculate comprehensive performance metrics."""
-        if not self.trades:
+        if self.n_trades == 0:
             self.metrics = {'error': 'No trades executed'}
             return
         
-        total_trades = len(self.trades)
-        winning_trades = [t for t in self.trades if t.pnl > 0]
-        losing_trades = [t for t in self.trades if t.pnl <= 0]
+        pnls = self._trades['pnl'][:self.n_trades]
+        win_mask = pnls > 0
+        
+        total_trades = len(pnls)
+        winning_trades = int(win_mask.sum())
+        losing_trades = total_trades - winning_trades
         
-        total_pnl = sum(t.pnl for t in self.trades)
-        gross_profit = sum(t.pnl for t in winning_trades) if winning_trades else 0
-        gross_loss = abs(sum(t.pnl for t in losing_trades)) if losing_trades else 0
+        total_pnl = float(pnls.sum())
+        gross_profit = float(pnls[win_mask].sum())
+        gross_loss = float(abs(pnls[~win_mask].sum()))
         
-        win_rate = (len(winning_trades) / total_trades) * 100 if total_trades > 0 else 0
-        avg_win = gross_profit / len(winning_trades) if winning_trades else 0
-        avg_loss = gross_loss / len(losing_trades) if losing_trades else 0
-        avg_trade = total_pnl / total_trades if total_trades > 0 else 0
+        win_rate = (winning_trades / total_trades) * 100
+        avg_win = gross_profit / winning_trades if winning_trades else 0
+        avg_loss = gross_loss / losing_trades if losing_trades else 0
+        avg_trade = total_pnl / total_trades
         
-        profit_factor = gross_profit / gross_loss if gross_loss > 0 else float('inf')
+        # None when there are no losses (an infinite ratio is not valid JSON)
+        profit_factor = round(gross_profit / gross_loss, 2) if gross_loss > 0 else None
         
-        equity_curve_df = pd.DataFrame(self.equity_curve)
-        equity_curve_df['cummax'] = equity_curve_df['equity'].cummax()
-        equity_curve_df['drawdown'] = equity_curve_df['equity'] - equity_curve_df['cummax']
-        equity_curve_df['drawdown_pct'] = (equity_curve_df['drawdown'] / equity_curve_df['cummax']) * 100
+        equity = self._eq_equity
+        cummax = np.maximum.accumulate(equity)
+        drawdown = np.subtract(equity, cummax)
+        max_drawdown = drawdown.min()
         
-        max_drawdown = equity_curve_df['drawdown'].min()
-        max_drawdown_pct = equity_curve_df['drawdown_pct'].min()
+        # Reuse the drawdown buffer for the percentage
+        np.divide(drawdown, cummax, out=drawdown)
+        drawdown *= 100
+        max_drawdown_pct = drawdown.min()
         
-        returns = equity_curve_df['equity'].pct_change().dropna()
+        returns = np.diff(equity) / equity[:-1]
         if len(returns) > 1:
-            sharpe_ratio = (returns.mean() / returns.std()) * np.sqrt(252) if returns.std() > 0 else 0
+            returns_std = returns.std(ddof=1)
+            sharpe_ratio = (returns.mean() / returns_std) * np.sqrt(252) if returns_std > 0 else 0
         else:
             sharpe_ratio = 0
         
         self.metrics = {
             'total_trades': total_trades,
-            'winning_trades': len(winning_trades),
-            'losing_trades': len(losing_trades),
+            'winning_trades': winning_trades,
+            'losing_trades': losing_trades,
             'win_rate_pct': round(win_rate, 2),
             'total_pnl': round(total_pnl, 2),
             'total_return_pct': round((total_pnl / self.initial_capital) * 100, 2),
             'gross_profit': round(gross_profit, 2),
             'gross_loss': round(gross_loss, 2),
-            'profit_factor': round(profit_factor, 2),
+            'profit_factor': profit_factor,
             'avg_trade': round(avg_trade, 2),
             'avg_win': round(avg_win, 2),
             'avg_loss': round(avg_loss, 2),
@@ -311,3 +524,34 @@ class Backtester:
             'expectancy': round(avg_trade, 2),
             'risk_reward_ratio': round(abs(avg_win / avg_loss), 2) if avg_loss != 0 else 0
         }
+
+
+def _bracket_max_bars(strategy: BaseStrategy) -> Optional[int]:
+    """
+    Time-exit limit for the compiled core, or None to run get_exit_price per bar.
+    
+    The bracket declared by get_bracket_max_bars only describes the
+    get_exit_price of the class that declares it; a subclass overriding
+    get_exit_price without re-declaring the bracket keeps the per-bar path.
+    """
+    cls = type(strategy)
+    owner = next(klass for klass in cls.__mro__ if 'get_bracket_max_bars' in vars(klass))
+    if getattr(cls, 'get_exit_price', None) is not getattr(owner, 'get_exit_price', None):
+        return None
+    return strategy.get_bracket_max_bars()
+
+
+def _takes_data_slice(get_exit_price) -> bool:
+    """True for the old get_exit_price(entry, stop, target, bars, data_slice) signature."""
+    params = inspect.signature(get_exit_price).parameters.values()
+    if any(p.kind is inspect.Parameter.VAR_POSITIONAL for p in params):
+        return False
+    positional = [p for p in params if p.kind in (inspect.Parameter.POSITIONAL_ONLY,
+                                                   inspect.Parameter.POSITIONAL_OR_KEYWORD)]
+    return len(positional) == 5
+
+
+def _run_one(strategy_cls, data: pd.DataFrame, config: Dict) -> Dict:
+    """Build a strategy and backtester for one config and run it (joblib worker)."""
+    strategy = strategy_cls(config['strategy'], config.get('time_filters', {}))
+    return Backtester(strategy, data, config).run()
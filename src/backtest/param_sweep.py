@@ -0,0 +1,142 @@
+"""
+Parameter Sweep
+
+Runs the volatility breakout strategy over a grid of parameter sets in a
+single compiled call. Each parameter set is an independent indicator,
+signal and simulation pass, so the sets are spread across cores with
+numba.prange; results come back as one contiguous array per metric.
+"""
+
+from itertools import product
+from typing import Dict, List
+import numpy as np
+import pandas as pd
+from ._core import _simulate_core
+from ..strategies.volatility_breakout import VolatilityBreakoutStrategy
+from ..strategies._indicators import _indicators_loop
+from ..strategies._signal_loop import _breakout_signals
+from ..utils._njit import njit, prange
+
+
+# Columns of the parameter grid, in order
+SWEEP_PARAMS = (
+    'lookback_period',
+    'atr_period',
+    'volatility_contraction_threshold',
+    'stop_loss_atr_multiple',
+    'take_profit_atr_multiple',
+)
+
+
+@njit(cache=True, parallel=True)
+def _sweep_core(ind_high, ind_low, ind_close, high, low, close, tradeable, day_id,
+                param_grid, max_trades, min_gap, max_bars, point_value, tick_value,
+                slippage_ticks, commission_per_side, initial_capital, max_daily_loss_pct):
+    """
+    Backtest every row of param_grid (columns as in SWEEP_PARAMS).
+
+    Indicators and signals are computed from ind_high/ind_low/ind_close (in
+    the strategy's precision); the simulation uses float64 high/low/close,
+    as the Backtester does.
+
+    Returns:
+        Tuple of (num_trades, gross_pnl, max_dd) arrays, one slot per row
+    """
+    n_sets = param_grid.shape[0]
+    num_trades = np.zeros(n_sets, np.int64)
+    gross_pnl = np.zeros(n_sets, np.float64)
+    max_dd = np.zeros(n_sets, np.float64)
+
+    for k in prange(n_sets):
+        lookback = int(param_grid[k, 0])
+        atr_period = int(param_grid[k, 1])
+
+        atr, atr_ma, rolling_high, rolling_low, is_contracted = _indicators_loop(
+            ind_high, ind_low, ind_close, atr_period, lookback, param_grid[k, 2]
+        )
+        min_bars = max(lookback, atr_period) + 10
+        signal, entry_price, stop_loss, take_profit = _breakout_signals(
+            ind_close, atr, rolling_high, rolling_low, is_contracted, tradeable,
+            day_id, min_bars, max_trades, min_gap, param_grid[k, 3], param_grid[k, 4]
+        )
+
+        result = _simulate_core(
+            high, low, close, signal.astype(np.float64), entry_price.astype(np.float64),
+            stop_loss.astype(np.float64), take_profit.astype(np.float64), day_id,
+            point_value, tick_value, slippage_ticks, commission_per_side,
+            initial_capital, max_daily_loss_pct, max_bars
+        )
+        pnl = result[5]
+        equity = result[9]
+
+        num_trades[k] = pnl.shape[0]
+        gross_pnl[k] = pnl.sum()
+
+        # Largest peak-to-trough drop of the equity curve, in dollars
+        peak = initial_capital
+        worst = 0.0
+        for i in range(equity.shape[0]):
+            peak = max(peak, equity[i])
+            worst = min(worst, equity[i] - peak)
+        max_dd[k] = worst
+
+    return num_trades, gross_pnl, max_dd
+
+
+def run_param_sweep(data: pd.DataFrame, param_grid: Dict[str, List], config: Dict) -> pd.DataFrame:
+    """
+    Backtest every combination of the values in param_grid.
+
+    Args:
+        data: OHLC bars
+        param_grid: Values to try for any of the SWEEP_PARAMS; parameters
+            not listed keep their value from config['strategy']
+        config: Full configuration (same layout as for Backtester);
+            indicators use config['strategy']['precision'] like the strategy
+
+    Returns:
+        DataFrame with one row per combination: the parameters followed by
+        num_trades, gross_pnl and max_dd
+    """
+    unknown = set(param_grid) - set(SWEEP_PARAMS)
+    if unknown:
+        raise ValueError(f"Cannot sweep parameters: {', '.join(sorted(unknown))}")
+
+    # Trading rules and time filters are shared by every parameter set
+    strategy = VolatilityBreakoutStrategy(config['strategy'], config.get('time_filters', {}))
+    defaults = {
+        'lookback_period': strategy.lookback_period,
+        'atr_period': strategy.atr_period,
+        'volatility_contraction_threshold': strategy.vol_threshold,
+        'stop_loss_atr_multiple': strategy.stop_loss_mult,
+        'take_profit_atr_multiple': strategy.take_profit_mult,
+    }
+    values = [param_grid.get(name, [defaults[name]]) for name in SWEEP_PARAMS]
+    grid = np.array(list(product(*values)), dtype=np.float64).reshape(-1, len(SWEEP_PARAMS))
+
+    tradeable = strategy.tradeable_mask(data)
+
+    num_trades, gross_pnl, max_dd = _sweep_core(
+        data['high'].to_numpy(dtype=strategy.precision),
+        data['low'].to_numpy(dtype=strategy.precision),
+        data['close'].to_numpy(dtype=strategy.precision),
+        data['high'].to_numpy(dtype=np.float64),
+        data['low'].to_numpy(dtype=np.float64),
+        data['close'].to_numpy(dtype=np.float64),
+        tradeable,
+        data.index.normalize().asi8,
+        grid,
+        int(strategy.max_trades_per_day), int(strategy.min_bars_between_trades),
+        int(strategy.max_bars_in_trade),
+        float(config['contract']['point_value']), float(config['contract']['tick_value']),
+        float(config['costs']['slippage_ticks']), float(config['costs']['commission_per_side']),
+        float(config['trading']['initial_capital']), float(config['risk']['max_daily_loss_pct'])
+    )
+
+    results = pd.DataFrame(grid, columns=list(SWEEP_PARAMS))
+    results = results.astype({'lookback_period': int, 'atr_period': int})
+    results['num_trades'] = num_trades
+    results['gross_pnl'] = gross_pnl
+    results['max_dd'] = max_dd
+
+    return results
@@ -4,18 +4,17 @@ Run Backtest - Main Entry Point
 This script runs a complete backtest and generates results.
 """
 
-import sys
 import os
 import yaml
 import pandas as pd
 import argparse
 from datetime import datetime
-import json
+import orjson
 
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
-from strategies.volatility_breakout import VolatilityBreakoutStrategy
-from backtest.backtester import Backtester
+from ..strategies.base_strategy import with_trading_hours
+from ..strategies.volatility_breakout import VolatilityBreakoutStrategy
+from .backtester import Backtester
+from ..utils.file_io import write_csv, load_price_data
 
 
 def load_config(config_path: str) -> dict:
@@ -31,14 +30,14 @@ def load_config(config_path: str) -> dict:
 
 
 def load_data(filename: str) -> pd.DataFrame:
-    """Load data from CSV file."""
+    """Load data from CSV or Parquet file."""
     filepath = os.path.join('data/historical', filename)
     
     if not os.path.exists(filepath):
         print(f"ERROR: File not found: {filepath}")
         return None
     
-    data = pd.read_csv(filepath, index_col=0, parse_dates=True)
+    data = load_price_data(filepath)
     print(f"Loaded {len(data)} bars from {filepath}")
     
     return data
@@ -75,7 +74,10 @@ def print_summary(results: dict, config: dict):
     print(f"{'─'*60}")
     print(f"Gross Profit: ${metrics['gross_profit']:>11,.2f}")
     print(f"Gross Loss: ${metrics['gross_loss']:>13,.2f}")
-    print(f"Profit Factor: {metrics['profit_factor']:>11.2f}")
+    if metrics['profit_factor'] is None:
+        print(f"Profit Factor: {'N/A':>11}")
+    else:
+        print(f"Profit Factor: {metrics['profit_factor']:>11.2f}")
     print(f"Avg Trade: ${metrics['avg_trade']:>14,.2f}")
     print(f"Avg Win: ${metrics['avg_win']:>17,.2f}")
     print(f"Avg Loss: ${metrics['avg_loss']:>16,.2f}")
@@ -83,41 +85,53 @@ def print_summary(results: dict, config: dict):
     print(f"\n{'='*60}\n")
 
 
+def _json_records(data: pd.DataFrame) -> list:
+    """
+    DataFrame rows as dicts for orjson.
+    
+    Datetime columns are converted in one pass to datetime objects, which
+    orjson writes as RFC 3339 (pandas Timestamps it would reject).
+    """
+    columns = {
+        col: (pd.DatetimeIndex(values).to_pydatetime()
+              if pd.api.types.is_datetime64_any_dtype(values) else values.tolist())
+        for col, values in data.items()
+    }
+    return [dict(zip(columns, row)) for row in zip(*columns.values())]
+
+
 def save_results(results: dict, config: dict, output_dir: str = 'logs'):
     """Save backtest results to files."""
     os.makedirs(output_dir, exist_ok=True)
     
     timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
     
+    equity_df = pd.DataFrame(results['equity_curve'])
+    trades_df = pd.DataFrame(results['trades'])
+    
     # Save full results as JSON
     results_file = os.path.join(output_dir, f'backtest_{timestamp}.json')
-    with open(results_file, 'w') as f:
-        trades = results['trades']
-        for trade in trades:
-            if 'entry_time' in trade and trade['entry_time']:
-                trade['entry_time'] = str(trade['entry_time'])
-            if 'exit_time' in trade and trade['exit_time']:
-                trade['exit_time'] = str(trade['exit_time'])
-        
-        json.dump({
-            'config': config,
-            'results': results
-        }, f, indent=2, default=str)
+    with open(results_file, 'wb') as f:
+        # orjson writes datetimes and NumPy values natively (NaN/inf become null)
+        f.write(orjson.dumps(
+            {'config': config, 'results': {**results,
+                                           'trades': _json_records(trades_df),
+                                           'equity_curve': _json_records(equity_df)}},
+            option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        ))
     
     print(f"\nFull results saved to: {results_file}")
     
     # Save trades as CSV
-    if results['trades']:
-        trades_df = pd.DataFrame(results['trades'])
+    if not trades_df.empty:
         trades_file = os.path.join(output_dir, f'trades_{timestamp}.csv')
-        trades_df.to_csv(trades_file, index=False)
+        write_csv(trades_df, trades_file, index=False)
         print(f"Trades saved to: {trades_file}")
     
     # Save equity curve
-    if results['equity_curve']:
-        equity_df = pd.DataFrame(results['equity_curve'])
+    if not equity_df.empty:
         equity_file = os.path.join(output_dir, f'equity_curve_{timestamp}.csv')
-        equity_df.to_csv(equity_file, index=False)
+        write_csv(equity_df, equity_file, index=False)
         print(f"Equity curve saved to: {equity_file}")
 
 
@@ -142,7 +156,7 @@ def main():
     else:
         data_dir = 'data/historical'
         if os.path.exists(data_dir):
-            files = [f for f in os.listdir(data_dir) if f.endswith('.csv')]
+            files = [f for f in os.listdir(data_dir) if f.endswith(('.csv', '.parquet'))]
             if files:
                 print(f"Found data files: {files}")
                 data_file = files[0]
@@ -150,7 +164,7 @@ def main():
                 data = load_data(data_file)
             else:
                 print("ERROR: No data files found in data/historical/")
-                print("Run: python src/data/data_downloader.py --start 2023-01-01 --end 2024-12-31")
+                print("Run: python -m src.data.data_downloader --start 2023-01-01 --end 2024-12-31")
                 return
         else:
             print("ERROR: data/historical/ directory not found")
@@ -159,6 +173,9 @@ def main():
     if data is None:
         return
     
+    # Trading-hours filter depends only on the bar times, so compute it once
+    data = with_trading_hours(data, config.get('time_filters', {}))
+    
     print(f"Using {len(data)} bars for backtest")
     
     # Initialize strategy
@@ -166,7 +183,7 @@ def main():
     strategy_name = config['strategy']['name']
     
     if strategy_name == 'volatility_breakout':
-        strategy = VolatilityBreakoutStrategy(config['strategy'])
+        strategy = VolatilityBreakoutStrategy(config['strategy'], config.get('time_filters', {}))
     else:
         print(f"ERROR: Unknown strategy: {strategy_name}")
         return
@@ -10,10 +10,20 @@ import numpy as np
 from datetime import datetime
 import yfinance as yf
 import os
+import hashlib
 import argparse
 
+from ..utils.file_io import write_csv, write_parquet, load_price_data
 
-def download_es_data(start_date: str, end_date: str, interval: str = '5m') -> pd.DataFrame:
+
+def cache_path(cache_dir: str, symbol: str, start_date: str, end_date: str, interval: str) -> str:
+    """Return the Parquet cache file for a download request."""
+    key = hashlib.sha1(f"{symbol}|{start_date}|{end_date}|{interval}".encode()).hexdigest()[:16]
+    return os.path.join(cache_dir, f"{key}.parquet")
+
+
+def download_es_data(start_date: str, end_date: str, interval: str = '5m',
+                     cache_dir: str = None, refresh: bool = False) -> pd.DataFrame:
     """
     Download E-mini S&P 500 data as proxy for MES.
     
@@ -21,21 +31,32 @@ def download_es_data(start_date: str, end_date: str, interval: str = '5m') -> pd
         start_date: Start date (YYYY-MM-DD)
         end_date: End date (YYYY-MM-DD)
         interval: Bar interval (1m, 5m, 15m, 1h, 1d)
+        cache_dir: Directory for cached downloads (no caching if None)
+        refresh: Ignore any cached copy and download again
         
     Returns:
         DataFrame with OHLCV data
     """
-    print(f"Downloading ES data from {start_date} to {end_date} ({interval} bars)...")
-    
     symbol = "ES=F"
     
+    cached_file = None
+    if cache_dir:
+        cached_file = cache_path(cache_dir, symbol, start_date, end_date, interval)
+        if not refresh and os.path.exists(cached_file):
+            data = pd.read_parquet(cached_file)
+            print(f"Loaded {len(data)} cached bars from {cached_file}")
+            return data
+    
+    print(f"Downloading ES data from {start_date} to {end_date} ({interval} bars)...")
+    
     try:
         data = yf.download(
             symbol,
             start=start_date,
             end=end_date,
             interval=interval,
-            progress=True
+            progress=False,
+            threads=True
         )
         
         if data.empty:
@@ -58,6 +79,10 @@ def download_es_data(start_date: str, end_date: str, interval: str = '5m') -> pd
         print(f"  Date range: {data.index[0]} to {data.index[-1]}")
         print(f"  Price range: ${data['low'].min():.2f} to ${data['high'].max():.2f}")
         
+        if cached_file:
+            os.makedirs(cache_dir, exist_ok=True)
+            write_parquet(data, cached_file)
+        
         return data
         
     except Exception as e:
@@ -66,26 +91,29 @@ def download_es_data(start_date: str, end_date: str, interval: str = '5m') -> pd
 
 
 def save_data(data: pd.DataFrame, filename: str):
-    """Save data to CSV file."""
+    """Save data to CSV or Parquet file (chosen by extension)."""
     output_dir = 'data/historical'
     os.makedirs(output_dir, exist_ok=True)
     
     filepath = os.path.join(output_dir, filename)
-    data.to_csv(filepath)
+    if filepath.endswith('.parquet'):
+        write_parquet(data, filepath)
+    else:
+        write_csv(data, filepath)
     
     print(f"\nData saved to: {filepath}")
     print(f"File size: {os.path.getsize(filepath) / 1024:.2f} KB")
 
 
 def load_data(filename: str) -> pd.DataFrame:
-    """Load data from CSV file."""
+    """Load data from CSV or Parquet file."""
     filepath = os.path.join('data/historical', filename)
     
     if not os.path.exists(filepath):
         print(f"ERROR: File not found: {filepath}")
         return None
     
-    data = pd.read_csv(filepath, index_col=0, parse_dates=True)
+    data = load_price_data(filepath)
     print(f"Loaded {len(data)} bars from {filepath}")
     
     return data
@@ -99,11 +127,16 @@ def main():
     parser.add_argument('--end', required=True, help='End date (YYYY-MM-DD)')
     parser.add_argument('--interval', default='5m', help='Bar interval (1m, 5m, 15m, 1h, 1d)')
     parser.add_argument('--output', help='Output filename (auto-generated if not provided)')
+    parser.add_argument('--format', choices=['csv', 'parquet'], default='csv',
+                        help='Output file format when --output is not given')
+    parser.add_argument('--cache-dir', default='data/cache', help='Directory for cached downloads')
+    parser.add_argument('--refresh', action='store_true', help='Ignore cached downloads and fetch again')
     
     args = parser.parse_args()
     
     # Download data
-    data = download_es_data(args.start, args.end, args.interval)
+    data = download_es_data(args.start, args.end, args.interval,
+                            cache_dir=args.cache_dir, refresh=args.refresh)
     
     if data is None:
         print("Failed to get data")
@@ -113,7 +146,7 @@ def main():
     if args.output:
         filename = args.output
     else:
-        filename = f"MES_{args.interval}_{args.start}_to_{args.end}.csv"
+        filename = f"MES_{args.interval}_{args.start}_to_{args.end}.{args.format}"
     
     # Save data
     save_data(data, filename)
@@ -0,0 +1,163 @@
+"""
+Compiled Indicator Kernels
+
+Single-pass indicator pipelines over raw OHLC arrays, compiled with Numba
+when available. Each kernel streams the price arrays once and fills all of
+its outputs together instead of making one pandas pass per indicator.
+
+Kernels accept float32 or float64 prices and return price-scaled outputs in
+the same dtype; running sums are always accumulated in float64. Both variants
+are declared up front, so they compile (or load from the on-disk cache) at
+import rather than on the first backtest.
+
+The per-bar building blocks (_true_range, _window_push, _deque_push) are
+shared by the batch loop and bar-by-bar updates (VolatilityBreakoutStrategy.update).
+"""
+
+import numpy as np
+from ..utils._njit import njit, RO_F4, RO_F8
+
+
+# Fast-math without 'nnan': NaN marks indicators that are not ready yet
+FASTMATH = {'nsz', 'arcp', 'contract', 'afn'}
+
+
+@njit(cache=True, nogil=True)
+def _nanmax(a, b):
+    """max(a, b) ignoring NaN (NaN only when both are)."""
+    return b if np.isnan(a) or b > a else a
+
+
+@njit(cache=True, nogil=True)
+def _true_range(high, low, prev_close, has_prev):
+    """
+    True range of one bar (high - low when there is no previous close).
+    
+    Like pandas' max(axis=1), NaN terms are skipped; the result is NaN only
+    when all of them are.
+    """
+    tr = np.float64(high - low)
+    if has_prev:
+        tr = _nanmax(tr, np.float64(abs(high - prev_close)))
+        tr = _nanmax(tr, np.float64(abs(low - prev_close)))
+    return tr
+
+
+@njit(cache=True, nogil=True)
+def _window_full(count, last_nan, window):
+    """
+    True when the window ending at the count-th value holds window values
+    and no NaN. last_nan starts at -1, so it also covers the warmup.
+    """
+    return last_nan <= count - window
+
+
+@njit(cache=True, nogil=True)
+def _window_push(buf, count, total, last_nan, value):
+    """
+    Add the count-th value to a running sum over the last len(buf) values.
+    
+    buf is the ring buffer of values in the window. A NaN value is kept out
+    of the sum (stored as 0) and recorded as last_nan instead, so the sum
+    recovers once it leaves the window, as pandas rolling sums do.
+    Returns the new (total, last_nan).
+    """
+    slot = count % buf.shape[0]
+    if count >= buf.shape[0]:
+        total -= buf[slot]
+    if np.isnan(value):
+        buf[slot] = 0.0
+        return total, count
+    buf[slot] = value
+    return total + value, last_nan
+
+
+@njit(cache=True, nogil=True)
+def _deque_push(idx, val, head, tail, last_nan, i, value, is_max):
+    """
+    Push bar i onto a monotonic deque of the last len(idx) bars.
+    
+    idx/val hold bar indices and prices in a ring buffer; values decrease
+    (is_max) or increase front to back, so val[head] is the window extreme.
+    Drops the index leaving the window and pops dominated entries first.
+    NaN values are not pushed but recorded as last_nan (see _window_full).
+    Returns the new (head, tail, last_nan).
+    """
+    window = idx.shape[0]
+    if tail > head and idx[head % window] <= i - window:
+        head += 1
+    if np.isnan(value):
+        return head, tail, i
+    while tail > head and (val[(tail - 1) % window] <= value if is_max
+                           else val[(tail - 1) % window] >= value):
+        tail -= 1
+    idx[tail % window] = i
+    val[tail % window] = value
+    return head, tail + 1, last_nan
+
+
+@njit([f'({RO_F4}, {RO_F4}, {RO_F4}, i8, i8, f8)',
+       f'({RO_F8}, {RO_F8}, {RO_F8}, i8, i8, f8)'],
+      cache=True, nogil=True, boundscheck=False, fastmath=FASTMATH)
+def _indicators_loop(high, low, close, atr_period, lookback, vol_threshold):
+    """
+    Compute the volatility breakout indicators in one pass.
+    
+    Returns:
+        Tuple of (atr, atr_ma, rolling_high, rolling_low, is_contracted).
+        Values are NaN (False for is_contracted) while their window is not
+        full or contains a NaN, matching pandas rolling(window).mean/max/min.
+    """
+    n = high.shape[0]
+    dtype = high.dtype
+    atr = np.full(n, np.nan, dtype)
+    atr_ma = np.full(n, np.nan, dtype)
+    rolling_high = np.full(n, np.nan, dtype)
+    rolling_low = np.full(n, np.nan, dtype)
+    is_contracted = np.zeros(n, np.bool_)
+
+    tr_buf = np.empty(atr_period, np.float64)
+    tr_sum = 0.0
+    tr_nan = -1
+    atr_buf = np.empty(lookback, np.float64)
+    atr_sum = 0.0
+    atr_nan = -1
+
+    max_idx = np.empty(lookback, np.int64)
+    max_val = np.empty(lookback, dtype)
+    max_head = 0
+    max_tail = 0
+    high_nan = -1
+    min_idx = np.empty(lookback, np.int64)
+    min_val = np.empty(lookback, dtype)
+    min_head = 0
+    min_tail = 0
+    low_nan = -1
+
+    for i in range(n):
+        # ATR: running mean of the last atr_period true ranges
+        tr = _true_range(high[i], low[i], close[i - 1], i > 0)
+        tr_sum, tr_nan = _window_push(tr_buf, i, tr_sum, tr_nan, tr)
+        a = np.nan
+        if _window_full(i, tr_nan, atr_period):
+            a = tr_sum / atr_period
+            atr[i] = a
+
+        # ATR moving average over the last lookback bars' ATR values
+        atr_sum, atr_nan = _window_push(atr_buf, i, atr_sum, atr_nan, a)
+        if _window_full(i, atr_nan, lookback):
+            a_ma = atr_sum / lookback
+            atr_ma[i] = a_ma
+            is_contracted[i] = a < vol_threshold * a_ma
+
+        # Breakout levels: highest high / lowest low over the lookback window
+        max_head, max_tail, high_nan = _deque_push(max_idx, max_val, max_head, max_tail,
+                                                   high_nan, i, high[i], True)
+        min_head, min_tail, low_nan = _deque_push(min_idx, min_val, min_head, min_tail,
+                                                  low_nan, i, low[i], False)
+        if _window_full(i, high_nan, lookback):
+            rolling_high[i] = max_val[max_head % lookback]
+        if _window_full(i, low_nan, lookback):
+            rolling_low[i] = min_val[min_head % lookback]
+
+    return atr, atr_ma, rolling_high, rolling_low, is_contracted
@@ -0,0 +1,182 @@
+"""
+Compiled Signal Loops
+
+Sequential passes that cannot be expressed as whole-array operations,
+compiled with Numba when available. Kernels called once per backtest are
+declared with explicit signatures so they compile eagerly at import.
+
+Per-bar steps (_throttle_step, _breakout_candidate, _bracket_levels) are
+shared with bar-by-bar updates (VolatilityBreakoutStrategy.update).
+"""
+
+import numpy as np
+from ..utils._njit import njit, prange, RO_F4, RO_F8, RO_I8, RO_B1
+from ..utils.exit_codes import EXIT_STOP, EXIT_TARGET, EXIT_TIME, EXIT_EOD
+from ._indicators import FASTMATH
+
+
+@njit(cache=True, nogil=True)
+def _throttle_step(is_long, is_short, day, current_day, trades_today, bars_since_trade,
+                   max_trades, min_gap):
+    """
+    Throttle one bar's breakout candidates.
+    
+    Returns:
+        Tuple of (signal, current_day, trades_today, bars_since_trade)
+    """
+    # Reset trade count at start of new day
+    if day != current_day:
+        current_day = day
+        trades_today = 0
+
+    bars_since_trade += 1
+
+    signal = 0
+    if trades_today < max_trades and bars_since_trade >= min_gap:
+        if is_long:
+            signal = 1
+        elif is_short:
+            signal = -1
+        if signal != 0:
+            trades_today += 1
+            bars_since_trade = 0
+
+    return signal, current_day, trades_today, bars_since_trade
+
+
+@njit(f'({RO_B1}, {RO_B1}, {RO_I8}, i8, i8, i8)', cache=True, nogil=True, boundscheck=False)
+def _apply_throttle(long_mask, short_mask, day_id, max_trades, min_gap, start):
+    """
+    Turn candidate breakouts into signals (1 long, -1 short, 0 none),
+    enforcing max trades per day and the minimum bar gap between trades.
+    """
+    n = long_mask.shape[0]
+    out = np.zeros(n, np.int8)
+    trades_today = 0
+    bars_since_trade = 999
+    current_day = day_id[start] - 1 if start < n else 0
+
+    for i in range(start, n):
+        out[i], current_day, trades_today, bars_since_trade = _throttle_step(
+            long_mask[i], short_mask[i], day_id[i], current_day, trades_today,
+            bars_since_trade, max_trades, min_gap
+        )
+
+    return out
+
+
+@njit(cache=True, nogil=True)
+def _breakout_candidate(close, atr, prev_high, prev_low, tradeable, is_contracted):
+    """(long, short) breakout flags for one bar; both False until indicators are ready."""
+    if np.isnan(atr) or np.isnan(prev_high) or not (tradeable and is_contracted):
+        return False, False
+    return close > prev_high, close < prev_low
+
+
+@njit(cache=True, nogil=True)
+def _bracket_levels(signal, prev_high, prev_low, atr, stop_mult, target_mult):
+    """(entry_price, stop_loss, take_profit) for one bar's signal; NaN without a signal."""
+    if signal == 1:
+        return prev_high, prev_high - stop_mult * atr, prev_high + target_mult * atr
+    if signal == -1:
+        return prev_low, prev_low + stop_mult * atr, prev_low - target_mult * atr
+    return np.nan, np.nan, np.nan
+
+
+@njit([f'({RO_F4}, {RO_F4}, {RO_F4}, {RO_F4}, {RO_B1}, {RO_B1}, {RO_I8}, i8, i8, i8, f8, f8)',
+       f'({RO_F8}, {RO_F8}, {RO_F8}, {RO_F8}, {RO_B1}, {RO_B1}, {RO_I8}, i8, i8, i8, f8, f8)'],
+      cache=True, nogil=True, boundscheck=False)
+def _breakout_signals(close, atr, rolling_high, rolling_low, is_contracted, tradeable,
+                      day_id, min_bars, max_trades, min_gap, stop_mult, target_mult):
+    """
+    Volatility breakout entries with their bracket levels.
+    
+    A bar is a candidate once its indicators are ready, it is tradeable and
+    volatility is contracted; it goes long above the previous bar's rolling
+    high and short below its rolling low. Candidates are then throttled.
+    
+    Returns:
+        Tuple of (signal, entry_price, stop_loss, take_profit); prices are
+        NaN on bars without a signal
+    """
+    n = close.shape[0]
+    long_mask = np.zeros(n, np.bool_)
+    short_mask = np.zeros(n, np.bool_)
+
+    # Breakout levels come from the previous bar to avoid lookahead
+    for i in range(max(min_bars, 1), n):
+        long_mask[i], short_mask[i] = _breakout_candidate(
+            close[i], atr[i], rolling_high[i - 1], rolling_low[i - 1],
+            tradeable[i], is_contracted[i]
+        )
+
+    signal = _apply_throttle(long_mask, short_mask, day_id, max_trades, min_gap, min_bars)
+
+    entry_price = np.full(n, np.nan, close.dtype)
+    stop_loss = np.full(n, np.nan, close.dtype)
+    take_profit = np.full(n, np.nan, close.dtype)
+    for i in range(n):
+        if signal[i] != 0:
+            entry_price[i], stop_loss[i], take_profit[i] = _bracket_levels(
+                signal[i], rolling_high[i - 1], rolling_low[i - 1], atr[i],
+                stop_mult, target_mult
+            )
+
+    return signal, entry_price, stop_loss, take_profit
+
+
+@njit(cache=True)
+def _bracket_exit(is_long, stop, target, bars_in_trade, max_bars, high, low, close):
+    """Return (exit_price, reason_code) for one bar; code 0 means still in the trade."""
+    if is_long:
+        if low <= stop:
+            return stop, EXIT_STOP
+        if high >= target:
+            return target, EXIT_TARGET
+    else:
+        if high >= stop:
+            return stop, EXIT_STOP
+        if low <= target:
+            return target, EXIT_TARGET
+
+    if bars_in_trade >= max_bars:
+        return close, EXIT_TIME
+
+    return np.nan, 0
+
+
+# Compiled lazily: the backtest path does not use it, so imports don't pay for it
+@njit(cache=True, parallel=True, nogil=True, boundscheck=False, fastmath=FASTMATH)
+def get_exit_prices_vec(entries, is_long, stop, target, max_bars, high, low, close):
+    """
+    Find the exit of every trade at once.
+    
+    Each trade scans forward from the bar after its entry until the stop,
+    target or time limit hits; trades still open at the last bar exit at
+    its close with EXIT_EOD.
+    
+    Returns:
+        Tuple of (exit_idx, exit_price, reason_code) arrays, one per entry
+    """
+    n = high.shape[0]
+    n_trades = entries.shape[0]
+    exit_idx = np.empty(n_trades, np.int64)
+    exit_px = np.empty(n_trades, np.float64)
+    reason = np.empty(n_trades, np.int8)
+
+    for k in prange(n_trades):
+        e = entries[k]
+        exit_idx[k] = n - 1
+        exit_px[k] = close[n - 1]
+        reason[k] = EXIT_EOD
+
+        for j in range(e + 1, n):
+            px, code = _bracket_exit(is_long[k], stop[k], target[k], j - e,
+                                     max_bars, high[j], low[j], close[j])
+            if code != 0:
+                exit_idx[k] = j
+                exit_px[k] = px
+                reason[k] = code
+                break
+
+    return exit_idx, exit_px, reason
@@ -6,18 +6,121 @@ Every strategy inherits from this class and implements key methods.
 """
 
 from abc import ABC, abstractmethod
-from typing import Dict, Optional
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional, Tuple
+import weakref
 import pandas as pd
 import numpy as np
+from ..utils._njit import NUMBA_AVAILABLE
+from ..utils.file_io import EXCHANGE_TZ
+
+try:
+    import bottleneck as bn
+except ImportError:
+    bn = None
+
+# pandas can run rolling (>= 1.3) and ewm (>= 1.4) aggregations through numba
+_PANDAS_VERSION = tuple(int(part) for part in pd.__version__.split('.')[:2])
+_ROLLING_ENGINE = 'numba' if NUMBA_AVAILABLE and _PANDAS_VERSION >= (1, 3) else 'cython'
+_EWM_ENGINE = 'numba' if NUMBA_AVAILABLE and _PANDAS_VERSION >= (1, 4) else 'cython'
+# copy-on-write makes pandas 3 concat copy-free already; it warns on copy=
+_CONCAT_KWARGS = {'copy': False} if _PANDAS_VERSION < (3, 0) else {}
+
+
+def _rolling_mean(values: np.ndarray, period: int) -> np.ndarray:
+    """Trailing mean over `period` values (NaN until the window is full)."""
+    if period > len(values):
+        return np.full(len(values), np.nan)
+    if bn is not None:
+        return bn.move_mean(values, window=period)
+    return pd.Series(values).rolling(window=period).mean().to_numpy()
+
+
+def market_hours_mask(index: pd.DatetimeIndex, config: Dict) -> np.ndarray:
+    """
+    Boolean array marking which bars fall within allowed trading hours.
+    
+    config holds the time filter settings (trade_only_rth,
+    avoid_first_minutes, avoid_last_minutes); without trade_only_rth every
+    bar is allowed.
+    """
+    if not config.get('trade_only_rth', False):
+        return np.ones(len(index), dtype=bool)
+    
+    # RTH is defined in US/Eastern wall-clock time; naive indexes are taken as local
+    if index.tz is not None:
+        index = index.tz_convert(EXCHANGE_TZ)
+    
+    # Minutes since midnight
+    minutes_of_day = index.hour.to_numpy() * 60 + index.minute.to_numpy()
+    
+    market_open = 9 * 60 + 30
+    market_close = 16 * 60
+    
+    avoid_first = config.get('avoid_first_minutes', 0)
+    avoid_last = config.get('avoid_last_minutes', 0)
+    
+    return ((minutes_of_day >= market_open + avoid_first) &
+            (minutes_of_day <= market_close - avoid_last))
+
+
+def with_trading_hours(data: pd.DataFrame, time_filters: Dict) -> pd.DataFrame:
+    """
+    data with an 'rth_ok' column built by market_hours_mask from time_filters.
+    
+    A frame that already has 'rth_ok' is returned unchanged.
+    """
+    if 'rth_ok' in data:
+        return data
+    return data.assign(rth_ok=market_hours_mask(data.index, time_filters))
+
+
+@dataclass
+class SignalBuffer:
+    """
+    Signal output as one contiguous array per field, aligned with index.
+    
+    signal is 1 (long), -1 (short) or 0; prices are NaN on bars without a
+    signal and use the strategy's precision dtype.
+    """
+    signal: np.ndarray
+    entry_price: np.ndarray
+    stop_loss: np.ndarray
+    take_profit: np.ndarray
+    index: pd.DatetimeIndex
+    
+    @classmethod
+    def from_frame(cls, data: pd.DataFrame) -> 'SignalBuffer':
+        """Build a buffer from the signal columns of a DataFrame."""
+        return cls(
+            signal=data['signal'].to_numpy(),
+            entry_price=data['entry_price'].to_numpy(),
+            stop_loss=data['stop_loss'].to_numpy(),
+            take_profit=data['take_profit'].to_numpy(),
+            index=data.index
+        )
 
 
 class BaseStrategy(ABC):
     """Abstract base class for all trading strategies."""
     
-    def __init__(self, config: Dict):
-        """Initialize strategy with configuration parameters."""
+    # Indicator frames kept per strategy instance (least recently used dropped first)
+    INDICATOR_CACHE_SIZE = 8
+    
+    def __init__(self, config: Dict, time_filters: Optional[Dict] = None):
+        """
+        Initialize strategy with configuration parameters.
+        
+        time_filters is the config's 'time_filters' section; it decides the
+        tradeable bars of data that has no precomputed 'rth_ok' column.
+        """
         self.config = config
+        self.time_filters = time_filters if time_filters is not None else {}
         self.name = config.get('name', 'base_strategy')
+        # Float dtype for indicator and signal arrays; 'float64' for full precision
+        self.precision = np.dtype(config.get('precision', 'float32'))
+        self._ind_cache = OrderedDict()
         self.data = None
         self.signals = None
         self.indicators = None
@@ -29,46 +132,106 @@ class BaseStrategy(ABC):
     
     @abstractmethod
     def generate_signals(self, data: pd.DataFrame) -> pd.DataFrame:
-        """Generate buy/sell signals based on indicators."""
+        """
+        Generate buy/sell signals based on indicators.
+        
+        Returns data with signal, entry_price, stop_loss and take_profit
+        columns. Strategies may also store the same arrays in self.signals
+        as a SignalBuffer, which the Backtester reads directly.
+        """
         pass
     
+    def cached_indicators(self, data: pd.DataFrame, params: Tuple,
+                          compute: Callable[[pd.DataFrame], pd.DataFrame]) -> pd.DataFrame:
+        """
+        Return compute(data), reusing the result of an earlier call with the
+        same data object and indicator parameters.
+        
+        Entries are keyed by id(data) and verified through a weak reference,
+        so a new frame that happens to reuse a freed id is never matched.
+        Frames modified in place are not detected.
+        """
+        key = (id(data),) + tuple(params)
+        entry = self._ind_cache.get(key)
+        if entry is not None and entry[0]() is data:
+            self._ind_cache.move_to_end(key)
+            return entry[1]
+        
+        result = compute(data)
+        self._ind_cache[key] = (weakref.ref(data), result)
+        while len(self._ind_cache) > self.INDICATOR_CACHE_SIZE:
+            self._ind_cache.popitem(last=False)
+        
+        return result
+    
+    def attach_columns(self, data: pd.DataFrame, columns: Dict[str, np.ndarray]) -> pd.DataFrame:
+        """
+        Return data with new columns appended, without copying its existing columns.
+        
+        Columns that already exist in data are replaced.
+        """
+        new_columns = pd.DataFrame(columns, index=data.index)
+        existing = data.columns.intersection(new_columns.columns)
+        if len(existing):
+            data = data.drop(columns=existing)
+        return pd.concat([data, new_columns], axis=1, **_CONCAT_KWARGS)
+    
     def calculate_atr(self, data: pd.DataFrame, period: int = 14) -> pd.Series:
         """Calculate Average True Range (ATR) - measure of volatility."""
-        high = data['high']
-        low = data['low']
-        close = data['close']
+        high = data['high'].to_numpy(dtype=np.float64)
+        low = data['low'].to_numpy(dtype=np.float64)
+        close = data['close'].to_numpy(dtype=np.float64)
         
-        tr1 = high - low
-        tr2 = abs(high - close.shift(1))
-        tr3 = abs(low - close.shift(1))
+        prev_close = np.empty(close.shape, dtype=close.dtype)
+        prev_close[:1] = np.nan
+        prev_close[1:] = close[:-1]
         
-        true_range = pd.concat([tr1, tr2, tr3], axis=1).max(axis=1)
-        atr = true_range.rolling(window=period).mean()
+        # Two buffers for the whole true range; fmax skips the missing previous
+        # close on the first bar (high - low is used)
+        true_range = np.subtract(high, prev_close)
+        np.abs(true_range, out=true_range)
+        buf = np.subtract(low, prev_close)
+        np.abs(buf, out=buf)
+        np.fmax(true_range, buf, out=true_range)
+        np.subtract(high, low, out=buf)
+        np.fmax(true_range, buf, out=true_range)
+        atr = _rolling_mean(true_range, period)
         
-        return atr
+        return pd.Series(atr, index=data.index)
     
     def calculate_ema(self, data: pd.Series, period: int) -> pd.Series:
         """Calculate Exponential Moving Average."""
-        return data.ewm(span=period, adjust=False).mean()
+        return data.ewm(span=period, adjust=False).mean(engine=_EWM_ENGINE)
     
     def calculate_sma(self, data: pd.Series, period: int) -> pd.Series:
         """Calculate Simple Moving Average."""
-        return data.rolling(window=period).mean()
+        return data.rolling(window=period).mean(engine=_ROLLING_ENGINE)
     
     def is_market_hours(self, timestamp: pd.Timestamp, config: Dict) -> bool:
         """Check if timestamp is within allowed trading hours."""
-        if not config.get('trade_only_rth', False):
-            return True
-            
-        market_open = 9 * 60 + 30
-        market_close = 16 * 60
-        
-        avoid_first = config.get('avoid_first_minutes', 0)
-        avoid_last = config.get('avoid_last_minutes', 0)
-        
-        current_time = timestamp.hour * 60 + timestamp.minute
+        return bool(self.market_hours_mask(pd.DatetimeIndex([timestamp]), config)[0])
+    
+    def market_hours_mask(self, index: pd.DatetimeIndex, config: Dict) -> np.ndarray:
+        """Boolean array marking which bars fall within allowed trading hours."""
+        return market_hours_mask(index, config)
+    
+    def tradeable_mask(self, data: pd.DataFrame) -> np.ndarray:
+        """The 'rth_ok' column of data, or the mask from this strategy's time_filters."""
+        if 'rth_ok' in data:
+            return data['rth_ok'].to_numpy(dtype=bool)
+        return self.market_hours_mask(data.index, self.time_filters)
+    
+    def get_bracket_max_bars(self) -> Optional[int]:
+        """
+        Return the time-exit bar limit if exits are a plain stop/target/time bracket.
         
-        return (market_open + avoid_first <= current_time <= market_close - avoid_last)
+        Strategies that return a value let the backtester use its compiled
+        simulation core. The default of None keeps the per-bar get_exit_price path.
+        The bracket only applies to the get_exit_price defined alongside it: a
+        subclass that overrides get_exit_price runs per bar unless it also
+        overrides this method.
+        """
+        return None
     
     def get_name(self) -> str:
         """Return strategy name."""
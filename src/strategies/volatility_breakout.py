@@ -13,18 +13,22 @@ Why This Can Work:
 - ATR-based stops adapt to market conditions
 """
 
-from typing import Dict, Tuple
+from typing import Dict, Optional, Tuple
 import pandas as pd
 import numpy as np
-from .base_strategy import BaseStrategy
+from .base_strategy import BaseStrategy, SignalBuffer
+from ._indicators import _indicators_loop, _true_range, _window_full, _window_push, _deque_push
+from ._signal_loop import (_breakout_signals, _bracket_exit, get_exit_prices_vec,
+                           _throttle_step, _breakout_candidate, _bracket_levels)
+from ..utils.exit_codes import EXIT_REASONS
 
 
 class VolatilityBreakoutStrategy(BaseStrategy):
     """Volatility Breakout Strategy for MES futures."""
     
-    def __init__(self, config: Dict):
+    def __init__(self, config: Dict, time_filters: Optional[Dict] = None):
         """Initialize strategy with parameters from config."""
-        super().__init__(config)
+        super().__init__(config, time_filters)
         
         # Extract strategy-specific parameters
         self.lookback_period = config.get('lookback_period', 20)
@@ -38,121 +42,204 @@ class VolatilityBreakoutStrategy(BaseStrategy):
         self.max_trades_per_day = config.get('max_trades_per_day', 3)
         self.min_bars_between_trades = config.get('min_bars_between_trades', 5)
         
-        # Track state
-        self.trades_today = 0
-        self.bars_since_trade = 999
-        self.current_date = None
+        # Bar-by-bar indicator and throttle state for update()
+        self._state = None
         
     def calculate_indicators(self, data: pd.DataFrame) -> pd.DataFrame:
         """Calculate all indicators needed for the strategy."""
-        df = data.copy()
-        
-        # Calculate ATR (current volatility)
-        df['atr'] = self.calculate_atr(df, self.atr_period)
-        
-        # Calculate average ATR over lookback period
-        df['atr_ma'] = df['atr'].rolling(window=self.lookback_period).mean()
-        
-        # Find recent highs and lows (breakout levels)
-        df['rolling_high'] = df['high'].rolling(window=self.lookback_period).max()
-        df['rolling_low'] = df['low'].rolling(window=self.lookback_period).min()
-        
-        # Is volatility contracted?
-        df['is_contracted'] = df['atr'] < (self.vol_threshold * df['atr_ma'])
-        
-        # Calculate range
-        df['range'] = df['high'] - df['low']
-        
-        return df
+        params = (self.atr_period, self.lookback_period, self.vol_threshold, self.precision.str)
+        return self.cached_indicators(data, params, self._compute_indicators)
+    
+    def _compute_indicators(self, data: pd.DataFrame) -> pd.DataFrame:
+        """Run the indicator kernel over the OHLC columns."""
+        high = data['high'].to_numpy(dtype=self.precision)
+        low = data['low'].to_numpy(dtype=self.precision)
+        close = data['close'].to_numpy(dtype=self.precision)
+        
+        # ATR, its moving average, breakout levels and contraction in one pass
+        atr, atr_ma, rolling_high, rolling_low, is_contracted = _indicators_loop(
+            high, low, close, int(self.atr_period), int(self.lookback_period),
+            float(self.vol_threshold)
+        )
+        
+        return self.attach_columns(data, {
+            'atr': atr,
+            'atr_ma': atr_ma,
+            'rolling_high': rolling_high,
+            'rolling_low': rolling_low,
+            'is_contracted': is_contracted
+        })
     
     def generate_signals(self, data: pd.DataFrame) -> pd.DataFrame:
         """Generate trading signals based on volatility breakout logic."""
-        df = data.copy()
-        
-        # Initialize signal columns
-        df['signal'] = 0
-        df['entry_price'] = np.nan
-        df['stop_loss'] = np.nan
-        df['take_profit'] = np.nan
-        
-        # Need sufficient data for indicators
-        min_required_bars = max(self.lookback_period, self.atr_period) + 10
-        
-        for i in range(min_required_bars, len(df)):
-            current_bar = df.iloc[i]
-            previous_bar = df.iloc[i-1]
-            
-            # Reset trade count at start of new day
-            if self.current_date != current_bar.name.date():
-                self.current_date = current_bar.name.date()
-                self.trades_today = 0
-            
-            self.bars_since_trade += 1
-            
-            # Skip if we've hit max trades or not enough time since last trade
-            if self.trades_today >= self.max_trades_per_day:
-                continue
-            if self.bars_since_trade < self.min_bars_between_trades:
-                continue
-            
-            # Get indicator values
-            is_contracted = current_bar['is_contracted']
-            rolling_high = previous_bar['rolling_high']
-            rolling_low = previous_bar['rolling_low']
-            current_close = current_bar['close']
-            current_atr = current_bar['atr']
-            
-            # Skip if indicators not ready
-            if pd.isna(current_atr) or pd.isna(rolling_high):
-                continue
-            
-            # LONG SIGNAL: Volatility contracted + breakout above high
-            if is_contracted and current_close > rolling_high:
-                df.loc[df.index[i], 'signal'] = 1
-                df.loc[df.index[i], 'entry_price'] = rolling_high
-                df.loc[df.index[i], 'stop_loss'] = rolling_high - (self.stop_loss_mult * current_atr)
-                df.loc[df.index[i], 'take_profit'] = rolling_high + (self.take_profit_mult * current_atr)
-                
-                self.trades_today += 1
-                self.bars_since_trade = 0
+        min_required_bars = self._min_required_bars()
+        
+        # Prefer the trading-hours column precomputed at load time
+        tradeable = self.tradeable_mask(data)
+        
+        signal, entry_price, stop_loss, take_profit = _breakout_signals(
+            data['close'].to_numpy(dtype=self.precision),
+            data['atr'].to_numpy(dtype=self.precision),
+            data['rolling_high'].to_numpy(dtype=self.precision),
+            data['rolling_low'].to_numpy(dtype=self.precision),
+            data['is_contracted'].to_numpy(dtype=bool),
+            tradeable,
+            data.index.normalize().asi8,
+            int(min_required_bars), int(self.max_trades_per_day),
+            int(self.min_bars_between_trades),
+            float(self.stop_loss_mult), float(self.take_profit_mult)
+        )
+        
+        self.signals = SignalBuffer(signal, entry_price, stop_loss, take_profit, data.index)
+        
+        return self.attach_columns(data, {
+            'signal': signal,
+            'entry_price': entry_price,
+            'stop_loss': stop_loss,
+            'take_profit': take_profit
+        })
+    
+    def update(self, new_bar: Dict) -> Tuple[int, float, float, float]:
+        """
+        Advance the strategy by one bar in O(1) and return its
+        (signal, entry_price, stop_loss, take_profit).
+        
+        new_bar needs 'time', 'high', 'low' and 'close'; an 'rth_ok' entry,
+        when present, replaces the trading-hours check. Feeding a series one
+        bar at a time gives the same signals as generate_signals with
+        float64 precision. Use reset_state() to start a new series.
+        """
+        state = self._state
+        if state is None:
+            state = self._state = self._new_state()
+        
+        i = state['bars']
+        timestamp = pd.Timestamp(new_bar['time'])
+        high = float(new_bar['high'])
+        low = float(new_bar['low'])
+        close = float(new_bar['close'])
+        
+        # ATR and its moving average from running window sums
+        atr = np.nan
+        is_contracted = False
+        tr = _true_range(high, low, state['prev_close'], i > 0)
+        state['tr_sum'], state['tr_nan'] = _window_push(
+            state['tr_buf'], i, state['tr_sum'], state['tr_nan'], tr)
+        if _window_full(i, state['tr_nan'], self.atr_period):
+            atr = state['tr_sum'] / self.atr_period
+        state['atr_sum'], state['atr_nan'] = _window_push(
+            state['atr_buf'], i, state['atr_sum'], state['atr_nan'], atr)
+        if _window_full(i, state['atr_nan'], self.lookback_period):
+            is_contracted = atr < self.vol_threshold * (state['atr_sum'] / self.lookback_period)
+        
+        # Breakout levels from the rolling high/low deques
+        state['max_head'], state['max_tail'], state['high_nan'] = _deque_push(
+            state['max_idx'], state['max_val'], state['max_head'], state['max_tail'],
+            state['high_nan'], i, high, True)
+        state['min_head'], state['min_tail'], state['low_nan'] = _deque_push(
+            state['min_idx'], state['min_val'], state['min_head'], state['min_tail'],
+            state['low_nan'], i, low, False)
+        rolling_high = rolling_low = np.nan
+        if _window_full(i, state['high_nan'], self.lookback_period):
+            rolling_high = state['max_val'][state['max_head'] % self.lookback_period]
+        if _window_full(i, state['low_nan'], self.lookback_period):
+            rolling_low = state['min_val'][state['min_head'] % self.lookback_period]
+        
+        signal = 0
+        if i >= self._min_required_bars():
+            if 'rth_ok' in new_bar:
+                tradeable = bool(new_bar['rth_ok'])
+            else:
+                tradeable = self.is_market_hours(timestamp, self.time_filters)
+            is_long, is_short = _breakout_candidate(close, atr, state['prev_high'], state['prev_low'],
+                                                    tradeable, is_contracted)
             
-            # SHORT SIGNAL: Volatility contracted + breakout below low
-            elif is_contracted and current_close < rolling_low:
-                df.loc[df.index[i], 'signal'] = -1
-                df.loc[df.index[i], 'entry_price'] = rolling_low
-                df.loc[df.index[i], 'stop_loss'] = rolling_low + (self.stop_loss_mult * current_atr)
-                df.loc[df.index[i], 'take_profit'] = rolling_low - (self.take_profit_mult * current_atr)
-                
-                self.trades_today += 1
-                self.bars_since_trade = 0
-        
-        return df
+            day = timestamp.normalize().value
+            if state['day'] is None:
+                state['day'] = day - 1
+            signal, state['day'], state['trades_today'], state['bars_since_trade'] = _throttle_step(
+                is_long, is_short, day, state['day'], state['trades_today'],
+                state['bars_since_trade'], int(self.max_trades_per_day),
+                int(self.min_bars_between_trades)
+            )
+        
+        entry_price, stop_loss, take_profit = _bracket_levels(
+            signal, state['prev_high'], state['prev_low'], atr,
+            float(self.stop_loss_mult), float(self.take_profit_mult)
+        )
+        
+        state['bars'] = i + 1
+        state['prev_close'] = close
+        state['prev_high'] = rolling_high
+        state['prev_low'] = rolling_low
+        
+        return int(signal), entry_price, stop_loss, take_profit
+    
+    def reset_state(self):
+        """Forget the bars fed to update()."""
+        self._state = None
+    
+    def _new_state(self) -> Dict:
+        """Empty state for update(): window buffers, running sums and throttle counters."""
+        return {
+            'bars': 0,
+            'prev_close': np.nan,
+            'prev_high': np.nan,
+            'prev_low': np.nan,
+            'tr_buf': np.empty(self.atr_period),
+            'tr_sum': 0.0,
+            'tr_nan': -1,
+            'atr_buf': np.empty(self.lookback_period),
+            'atr_sum': 0.0,
+            'atr_nan': -1,
+            'max_idx': np.empty(self.lookback_period, dtype=np.int64),
+            'max_val': np.empty(self.lookback_period),
+            'max_head': 0,
+            'max_tail': 0,
+            'high_nan': -1,
+            'min_idx': np.empty(self.lookback_period, dtype=np.int64),
+            'min_val': np.empty(self.lookback_period),
+            'min_head': 0,
+            'min_tail': 0,
+            'low_nan': -1,
+            'day': None,
+            'trades_today': 0,
+            'bars_since_trade': 999
+        }
+    
+    def _min_required_bars(self) -> int:
+        """Bars of history needed before the first signal."""
+        return max(self.lookback_period, self.atr_period) + 10
     
     def get_exit_price(self, entry_price: float, stop_loss: float, 
                       take_profit: float, bars_in_trade: int,
-                      data_slice: pd.DataFrame) -> Tuple[float, str]:
+                      current_high: float, current_low: float,
+                      current_close: float, direction: int) -> Tuple[float, str]:
         """Determine exit price and reason based on market action."""
-        current_high = data_slice['high'].iloc[0]
-        current_low = data_slice['low'].iloc[0]
-        current_close = data_slice['close'].iloc[0]
-        
-        is_long = stop_loss < entry_price
-        
-        if is_long:
-            if current_low <= stop_loss:
-                return stop_loss, 'stop_loss'
-            if current_high >= take_profit:
-                return take_profit, 'take_profit'
-        else:
-            if current_high >= stop_loss:
-                return stop_loss, 'stop_loss'
-            if current_low <= take_profit:
-                return take_profit, 'take_profit'
-        
-        if bars_in_trade >= self.max_bars_in_trade:
-            return current_close, 'time_exit'
-        
-        return None, 'in_trade'
+        exit_price, code = _bracket_exit(direction == 1, stop_loss, take_profit, bars_in_trade,
+                                         self.max_bars_in_trade, current_high, current_low,
+                                         current_close)
+        if code == 0:
+            return None, 'in_trade'
+        
+        return exit_price, EXIT_REASONS[code]
+    
+    def get_exit_prices_vec(self, entries: np.ndarray, is_long: np.ndarray,
+                            stop_loss: np.ndarray, take_profit: np.ndarray,
+                            high: np.ndarray, low: np.ndarray,
+                            close: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Batched get_exit_price: (exit_idx, exit_price, reason_code) for every entry bar.
+        
+        Standalone API for analysing a set of entries; the Backtester's
+        compiled core runs its own exit scan and does not call this.
+        """
+        return get_exit_prices_vec(entries, is_long, stop_loss, take_profit,
+                                   int(self.max_bars_in_trade), high, low, close)
+    
+    def get_bracket_max_bars(self) -> int:
+        """Exits are stop, target, or time based, so the compiled core can run them."""
+        return self.max_bars_in_trade
     
     def __str__(self) -> str:
         return (f"Volatility Breakout Strategy\n"
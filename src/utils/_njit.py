@@ -0,0 +1,31 @@
+"""
+Optional Numba Support
+
+Re-exports numba's njit and prange when numba is installed. Without numba the
+stand-ins below leave decorated functions as plain Python, so compiled kernels
+still produce identical results, just slower.
+"""
+
+# Read-only 1-d array types for explicit signatures; pandas hands out
+# read-only views, and writable arrays convert to these implicitly
+RO_F4 = 'Array(f4, 1, "A", readonly=True)'
+RO_F8 = 'Array(f8, 1, "A", readonly=True)'
+RO_I8 = 'Array(i8, 1, "A", readonly=True)'
+RO_B1 = 'Array(b1, 1, "A", readonly=True)'
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        """No-op replacement for numba.njit supporting both decorator forms."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+
+        def decorator(func):
+            return func
+
+        return decorator
@@ -0,0 +1,19 @@
+"""
+Exit Reason Codes
+
+Integer codes for why a trade exited, shared by the strategies' compiled
+exit scans and the backtester's simulation core, plus their names as they
+appear in trade records.
+"""
+
+EXIT_STOP = 1
+EXIT_TARGET = 2
+EXIT_TIME = 3
+EXIT_EOD = 4
+
+EXIT_REASONS = {
+    EXIT_STOP: 'stop_loss',
+    EXIT_TARGET: 'take_profit',
+    EXIT_TIME: 'time_exit',
+    EXIT_EOD: 'end_of_data',
+}
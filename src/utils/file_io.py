@@ -0,0 +1,69 @@
+"""
+File I/O Helpers
+
+Fast DataFrame readers and writers backed by PyArrow, shared by the data
+downloader and the backtest runner.
+"""
+
+import os
+import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
+
+
+# Session times and trading days are defined in US/Eastern time
+EXCHANGE_TZ = 'America/New_York'
+
+# Parquet caches of CSV files live in this subdirectory of the CSV's folder,
+# so listings of the data folder show each dataset once
+CSV_CACHE_DIR = '.cache'
+
+
+def write_csv(data: pd.DataFrame, filepath: str, index: bool = True):
+    """Write a DataFrame to CSV using Arrow's multi-threaded writer."""
+    if index:
+        data = data.reset_index()
+    pacsv.write_csv(pa.Table.from_pandas(data, preserve_index=False), filepath)
+
+
+def write_parquet(data: pd.DataFrame, filepath: str):
+    """Write a DataFrame (including its index) to a Parquet file."""
+    pq.write_table(pa.Table.from_pandas(data), filepath)
+
+
+def load_price_data(filepath: str) -> pd.DataFrame:
+    """
+    Load OHLCV bars from a CSV or Parquet file.
+    
+    CSV files are parsed with the PyArrow engine and cached as
+    zstd-compressed Parquet in a CSV_CACHE_DIR folder beside the source;
+    later loads use the cache as long as it is newer than the CSV. Timezone-aware indexes are returned in
+    exchange time (EXCHANGE_TZ), since Arrow parses UTC offsets into UTC.
+    """
+    if filepath.endswith('.parquet'):
+        return _to_exchange_tz(pd.read_parquet(filepath))
+    
+    cache_path = _csv_cache_path(filepath)
+    if os.path.exists(cache_path) and os.path.getmtime(cache_path) >= os.path.getmtime(filepath):
+        return _to_exchange_tz(pd.read_parquet(cache_path))
+    
+    data = pd.read_csv(filepath, engine='pyarrow', index_col=0, parse_dates=[0])
+    data = _to_exchange_tz(data)
+    os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+    data.to_parquet(cache_path, compression='zstd')
+    
+    return data
+
+
+def _csv_cache_path(filepath: str) -> str:
+    """Return the Parquet cache file for a CSV file."""
+    folder, name = os.path.split(filepath)
+    return os.path.join(folder, CSV_CACHE_DIR, os.path.splitext(name)[0] + '.parquet')
+
+
+def _to_exchange_tz(data: pd.DataFrame) -> pd.DataFrame:
+    """Convert a timezone-aware index to exchange time; naive indexes are left alone."""
+    if isinstance(data.index, pd.DatetimeIndex) and data.index.tz is not None:
+        data.index = data.index.tz_convert(EXCHANGE_TZ)
+    return data
@@ -0,0 +1,45 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+
+@pytest.fixture
+def config():
+    return {
+        'trading': {'initial_capital': 10000, 'position_size': 1, 'max_positions': 1},
+        'contract': {'tick_size': 0.25, 'tick_value': 1.25, 'point_value': 5.0},
+        'costs': {'commission_per_side': 0.60, 'slippage_ticks': 1},
+        'risk': {'max_daily_loss_pct': 3.0},
+        'time_filters': {'trade_only_rth': True, 'avoid_first_minutes': 15,
+                         'avoid_last_minutes': 15},
+        'strategy': {
+            'lookback_period': 20,
+            'atr_period': 14,
+            'volatility_contraction_threshold': 0.95,
+            'stop_loss_atr_multiple': 2.0,
+            'take_profit_atr_multiple': 3.0,
+            'max_bars_in_trade': 50,
+            'max_trades_per_day': 3,
+            'min_bars_between_trades': 5,
+        },
+    }
+
+
+@pytest.fixture
+def bars():
+    """20 sessions of random-walk 5-minute RTH bars in exchange time."""
+    rng = np.random.default_rng(0)
+    days = pd.bdate_range('2023-01-02', periods=20)
+    times = pd.timedelta_range('09:30:00', '15:55:00', freq='5min')
+    index = pd.DatetimeIndex((days.values[:, None] + times.values[None, :]).ravel())
+    index = index.tz_localize('America/New_York')
+    close = np.round(4000 * np.exp(np.cumsum(rng.normal(0, 0.001, len(index)))) * 4) / 4
+    spread = np.round(rng.uniform(0, 1, (2, len(index))) * close * 0.004) / 4
+    open_ = np.concatenate(([close[0]], close[:-1]))
+    return pd.DataFrame({
+        'open': open_,
+        'high': np.maximum(close + spread[0], open_),
+        'low': np.minimum(close - spread[1], open_),
+        'close': close,
+        'volume': 1000,
+    }, index=index)
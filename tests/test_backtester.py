@@ -0,0 +1,77 @@
+import contextlib
+import io
+
+from src.backtest.backtester import Backtester
+from src.backtest.param_sweep import run_param_sweep
+from src.strategies.base_strategy import with_trading_hours
+from src.strategies.volatility_breakout import VolatilityBreakoutStrategy
+
+
+def _run(strategy, bars, config):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return Backtester(strategy, bars, config).run()
+
+
+class _ExitEveryBar(VolatilityBreakoutStrategy):
+    def get_exit_price(self, entry_price, stop_loss, take_profit, bars_in_trade,
+                       high, low, close, direction):
+        return close, 'custom'
+
+
+def test_overridden_exit_is_honored(bars, config):
+    result = _run(_ExitEveryBar(config['strategy']), bars, config)
+
+    assert result['trades']
+    assert {trade['exit_reason'] for trade in result['trades']} == {'custom'}
+
+
+def test_compiled_core_matches_per_bar_path(bars, config):
+    strategy = VolatilityBreakoutStrategy(config['strategy'])
+    compiled = _run(strategy, bars, config)
+
+    per_bar = VolatilityBreakoutStrategy(config['strategy'])
+    per_bar.get_bracket_max_bars = lambda: None
+    python = _run(per_bar, bars, config)
+
+    assert compiled['trades']
+    assert compiled['metrics'] == python['metrics']
+
+
+def test_time_filters_apply_without_rth_column(bars, config):
+    strategy = VolatilityBreakoutStrategy(config['strategy'])
+    programmatic = _run(strategy, bars, config)
+
+    cli_bars = with_trading_hours(bars, config['time_filters'])
+    cli_strategy = VolatilityBreakoutStrategy(config['strategy'], config['time_filters'])
+    cli = _run(cli_strategy, cli_bars, config)
+
+    assert 'rth_ok' not in bars
+    assert programmatic['metrics'] == cli['metrics']
+
+
+def test_param_sweep_matches_backtester(bars, config):
+    results = run_param_sweep(bars, {'lookback_period': [10, 20]}, config)
+
+    for row in results.itertuples():
+        row_config = {**config, 'strategy': {**config['strategy'],
+                                             'lookback_period': row.lookback_period}}
+        strategy = VolatilityBreakoutStrategy(row_config['strategy'])
+        metrics = _run(strategy, bars, row_config)['metrics']
+        assert row.num_trades == metrics['total_trades']
+        assert round(row.gross_pnl, 2) == metrics['total_pnl']
+
+
+def test_trades_property_matches_get_trades(bars, config):
+    backtester = Backtester(VolatilityBreakoutStrategy(config['strategy']), bars, config)
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = backtester.run()
+
+    assert backtester.trades == backtester.get_trades() == result['trades']
+
+
+def test_equity_curve_is_list_of_records(bars, config):
+    result = _run(VolatilityBreakoutStrategy(config['strategy']), bars, config)
+
+    assert isinstance(result['equity_curve'], list)
+    assert len(result['equity_curve']) == len(bars)
+    assert set(result['equity_curve'][0]) == {'time', 'equity', 'drawdown_pct'}
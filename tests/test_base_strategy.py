@@ -0,0 +1,25 @@
+import numpy as np
+import pandas as pd
+
+from src.strategies.volatility_breakout import VolatilityBreakoutStrategy
+
+
+def test_calculate_atr_matches_pandas(bars, config):
+    strategy = VolatilityBreakoutStrategy(config['strategy'])
+    prev_close = bars['close'].shift(1)
+    true_range = pd.concat([
+        bars['high'] - bars['low'],
+        (bars['high'] - prev_close).abs(),
+        (bars['low'] - prev_close).abs(),
+    ], axis=1).max(axis=1)
+
+    atr = strategy.calculate_atr(bars, period=14)
+
+    pd.testing.assert_series_equal(atr, true_range.rolling(window=14).mean())
+
+
+def test_calculate_atr_short_and_empty_frames(bars, config):
+    strategy = VolatilityBreakoutStrategy(config['strategy'])
+
+    assert strategy.calculate_atr(bars.iloc[:5], period=14).isna().all()
+    assert strategy.calculate_atr(bars.iloc[:0], period=14).empty
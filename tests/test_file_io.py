@@ -0,0 +1,18 @@
+import os
+
+import pandas as pd
+
+from src.utils.file_io import EXCHANGE_TZ, load_price_data, write_csv
+
+
+def test_csv_cache_is_kept_out_of_the_data_folder(bars, tmp_path):
+    csv_file = tmp_path / 'MES.csv'
+    write_csv(bars, str(csv_file))
+
+    first = load_price_data(str(csv_file))
+    cached = load_price_data(str(csv_file))
+
+    assert sorted(os.listdir(tmp_path)) == ['.cache', 'MES.csv']
+    assert os.listdir(tmp_path / '.cache') == ['MES.parquet']
+    assert str(first.index.tz) == EXCHANGE_TZ
+    pd.testing.assert_frame_equal(first, cached)